@@ -2,17 +2,68 @@
 # translate_cli.py
 
 import argparse
-from transformers import pipeline, M2M100ForConditionalGeneration, M2M100Tokenizer
+import collections
+import contextlib
+import functools
+import importlib.util
+import json
 import logging
 import sys
-from typing import Generator, Dict, Optional
+from typing import Callable, Generator, Dict, Iterable, List, Optional, Tuple
 import yaml
 import os
+import platform
+import re
+import tempfile
+import threading
+import time
 
 # Constants for configuration paths
 DEFAULT_CONFIG_PATH = os.path.expanduser("~/.config/translator/config.yaml")
 PROJECT_CONFIG_PATH = os.path.join(os.path.dirname(__file__), "config.yaml")
 
+# libyaml's C parser when PyYAML was built with it, otherwise the pure-Python safe loader
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Hugging Face model cache, created once at import instead of on every translation.
+# Resolved from the same environment variables as huggingface_hub, without importing it.
+CACHE_DIR = os.path.expanduser(
+    os.environ.get("HF_HUB_CACHE")
+    or os.environ.get("HUGGINGFACE_HUB_CACHE")
+    or os.path.join(
+        os.environ.get("HF_HOME") or os.path.join(os.environ.get("XDG_CACHE_HOME", "~/.cache"), "huggingface"), "hub"
+    )
+)
+os.makedirs(CACHE_DIR, exist_ok=True)
+
+# On-disk cache for kernels compiled by torch.compile
+COMPILE_CACHE_DIR = os.path.expanduser("~/.cache/translator/inductor")
+# Set before transformers imports torch._inductor, which fixes the cache location
+os.environ.setdefault("TORCHINDUCTOR_CACHE_DIR", COMPILE_CACHE_DIR)
+
+# With HF_HUB_OFFLINE set, models are only loaded from the cache and never downloaded
+HF_HUB_OFFLINE = os.environ.get("HF_HUB_OFFLINE", "").lower() in ("1", "true", "yes", "on")
+
+# Written next to a model's snapshots once --prefetch has fully prepared it
+READY_MARKER = "ready.marker"
+
+# Text translated once by --prefetch to build and warm every cached artifact
+PREFETCH_TEXT = "Hallo Welt."
+
+# Number of files downloaded in parallel when fetching a model
+DOWNLOAD_WORKERS = 16
+
+# Use the Rust downloader for large files when it is installed. huggingface_hub reads this
+# once at import, so it is set here, before the first (lazy) import.
+if importlib.util.find_spec("hf_transfer") is not None:
+    os.environ.setdefault("HF_HUB_ENABLE_HF_TRANSFER", "1")
+
+# Unix socket used by the background translation daemon
+DAEMON_SOCKET_PATH = os.path.expanduser("~/.cache/translate_cli.sock")
+
+# Packages every translation needs; imported lazily, but checked for once at startup
+REQUIRED_PACKAGES = ["torch", "transformers", "huggingface_hub"]
+
 # Available model providers and their base configurations
 MODEL_PROVIDERS = {
     "helsinki": {
@@ -34,6 +85,88 @@ MODEL_PROVIDERS = {
     }
 }
 
+# Speed/quality trade-offs selected with --preset, as command-line destinations and values.
+# Explicit command-line options take precedence. model_size picks the provider's smallest
+# or largest model, for providers that offer several sizes.
+PRESETS = {
+    "fast": {"beams": 1, "quantize": "int8", "model_size": "smallest"},
+    "quality": {"beams": 4, "quantize": "none", "model_size": "largest"},
+}
+
+# Available inference backends
+BACKENDS = ["transformers", "ctranslate2", "onnxruntime"]
+
+# Short names accepted for the inference backends
+BACKEND_ALIASES = {"hf": "transformers", "ct2": "ctranslate2", "ort": "onnxruntime"}
+
+# Threads per CTranslate2 batch worker; the remaining cores run further batches in parallel
+CT2_INTRA_THREADS = 4
+
+# Carries --interop-threads to worker and daemon processes, like OMP_NUM_THREADS for --threads
+INTEROP_THREADS_ENV = "TRANSLATOR_INTEROP_THREADS"
+
+# Weight quantization modes for the transformers backend
+QUANTIZATION_MODES = ["none", "int8"]
+
+# Model compilation modes for the transformers backend
+# 'ort' is shorthand for the onnxruntime backend, which exports and optimizes the model graph
+COMPILE_MODES = ["none", "torch", "ort"]
+
+# Devices the models can run on; 'auto' picks the fastest available one
+DEVICES = ["auto", "cpu", "cuda", "mps"]
+
+# Floating point precisions for the transformers backend, mapped to torch dtype names.
+# torch and transformers are imported lazily so that --help and argument errors stay fast.
+DTYPES = {
+    "fp32": "float32",
+    "bf16": "bfloat16",
+    "fp16": "float16",
+}
+
+# Precision choices: the DTYPES above, or 'auto' to pick the fastest one for the device
+DTYPE_CHOICES = ["auto"] + list(DTYPES)
+
+# Number of texts passed to the model per forward pass
+DEFAULT_BATCH_SIZE = 8
+
+# Approximate number of characters translated per block when streaming files or stdin
+STREAM_CHUNK_SIZE = 1024
+
+# Write buffer for output files, so translated blocks reach the disk in few large writes
+OUTPUT_BUFFER_SIZE = 1 << 20
+# Characters read from an input file at once, then cut into chunks of whole lines
+READ_BLOCK_SIZE = 1 << 16
+# Blocks read ahead of the translation by the reader thread
+READ_AHEAD_BLOCKS = 8
+
+# Fallback sentence boundary used when pysbd is not installed: whitespace after sentence-ending
+# punctuation, also when a closing quote or bracket follows it
+SENTENCE_BOUNDARY = re.compile(r"(?:(?<=[.!?…])|(?<=[.!?…][\"'»«“”‘’)\]]))\s+")
+
+# File name of the encoder produced by the cached ONNX export
+ONNX_ENCODER_FILE = "encoder_model_quantized_optimized.onnx"
+
+# Weight files of a downloaded model, either whole or as an index of shards
+WEIGHT_FILES = ["model.safetensors", "pytorch_model.bin"]
+WEIGHT_INDEX_FILES = ["model.safetensors.index.json", "pytorch_model.bin.index.json"]
+
+# Tokenizers loaded in this process, keyed by model path and source language
+_TOKENIZERS: Dict = {}
+
+# Local snapshot paths of models resolved in this process, keyed by model name
+_MODEL_PATHS: Dict[str, str] = {}
+
+# Where finished translations are looked up before running the model: 'memory' keeps the
+# most recent ones in this process, 'disk' also persists them in an SQLite database
+TRANSLATION_CACHE_MODES = ["none", "memory", "disk"]
+TRANSLATION_CACHE_SIZE = 10000
+TRANSLATION_CACHE_PATH = os.path.expanduser("~/.cache/translator/translations.sqlite")
+# Translations kept on disk; older ones are pruned as new ones are stored
+TRANSLATION_DB_MAX_ROWS = 1_000_000
+
+# Translations done in this process, keyed by translation settings and source text, oldest first
+_TRANSLATIONS: "collections.OrderedDict[tuple, str]" = collections.OrderedDict()
+
 # Initial basic logging config - will be overridden by command line args
 logging.basicConfig(
     level=logging.INFO,
@@ -42,35 +175,93 @@ logging.basicConfig(
 logging.getLogger("transformers").setLevel(logging.ERROR)
 
 
-def load_config():
-    """Load configuration from both user and project config files."""
+def apply_preset(
+    args: argparse.Namespace, parser: argparse.ArgumentParser, argv: Optional[List[str]] = None
+) -> None:
+    """Apply the --preset settings to every option not given on the command line."""
+    preset = PRESETS[args.preset]
+    # Parse again with a marker as default: options still holding it were not given, so an
+    # explicit value that equals the default (e.g. --beams 1) still overrides the preset
+    unset = object()
+    dests = list(preset) + ["dtype"]
+    defaults = {dest: parser.get_default(dest) for dest in dests}
+    parser.set_defaults(**{dest: unset for dest in dests})
+    try:
+        given = parser.parse_args(argv)
+    finally:
+        parser.set_defaults(**defaults)
+
+    for dest, value in preset.items():
+        if getattr(given, dest) is not unset:
+            continue
+        if dest == "model_size":
+            sizes = MODEL_PROVIDERS[args.provider].get("sizes")
+            if not sizes or args.model:
+                continue
+            value = sizes[0] if value == "smallest" else sizes[-1]
+        if dest == "quantize" and value == "int8":
+            # int8 weights are the fast choice only on the CPU; an explicit --dtype wins,
+            # and GPUs keep their half-precision weights
+            if given.dtype is not unset:
+                continue
+            if args.backend != "onnxruntime" and resolve_device(args.device) != "cpu":
+                args.dtype = "auto"
+                continue
+        setattr(args, dest, value)
+
+
+def check_dependencies() -> None:
+    """Exit with an install hint if a required package is missing.
+
+    Runs once at startup without importing anything, so the heavy packages are still
+    loaded lazily, only when a translation needs them.
+    """
+    missing = [name for name in REQUIRED_PACKAGES if importlib.util.find_spec(name) is None]
+    if missing:
+        logging.error(f"ImportError: missing {', '.join(missing)}. Make sure required packages are installed.")
+        logging.error("Try running: pip install torch transformers sacremoses protobuf huggingface_hub")
+        sys.exit(1)
+
+
+@functools.lru_cache(maxsize=1)
+def load_config() -> dict:
+    """Load configuration from both user and project config files, once per process.
+
+    A config.json next to a config.yaml takes its place; JSON is parsed in C by the
+    standard library. The returned dict is shared between callers and must not be modified.
+    """
     config = {}
-    
-    # Try loading user config
-    if os.path.exists(DEFAULT_CONFIG_PATH):
+    for label, path in (("user", DEFAULT_CONFIG_PATH), ("project", PROJECT_CONFIG_PATH)):
+        # Project config overrides user config; a missing file is skipped without a separate exists check
+        json_path = os.path.splitext(path)[0] + ".json"
         try:
-            with open(DEFAULT_CONFIG_PATH, 'r') as f:
-                user_config = yaml.safe_load(f) or {}
-                config.update(user_config)
-            logging.debug(f"Loaded user config from: {DEFAULT_CONFIG_PATH}")
-        except (yaml.YAMLError, FileNotFoundError) as e:
-            logging.warning(f"Error loading user config from {DEFAULT_CONFIG_PATH}: {e}")
-    
-    # Try loading project config (overrides user config)
-    if os.path.exists(PROJECT_CONFIG_PATH):
+            with open(json_path, 'r') as f:
+                config.update(json.load(f) or {})
+            logging.debug(f"Loaded {label} config from: {json_path}")
+            continue
+        except FileNotFoundError:
+            pass
+        except ValueError as e:
+            logging.warning(f"Error loading {label} config from {json_path}: {e}")
+            continue
         try:
-            with open(PROJECT_CONFIG_PATH, 'r') as f:
-                project_config = yaml.safe_load(f) or {}
-                config.update(project_config)
-            logging.debug(f"Loaded project config from: {PROJECT_CONFIG_PATH}")
-        except (yaml.YAMLError, FileNotFoundError) as e:
-            logging.warning(f"Error loading project config from {PROJECT_CONFIG_PATH}: {e}")
-    
+            with open(path, 'r') as f:
+                config.update(yaml.load(f, Loader=YAML_LOADER) or {})
+            logging.debug(f"Loaded {label} config from: {path}")
+        except FileNotFoundError:
+            continue
+        except yaml.YAMLError as e:
+            logging.warning(f"Error loading {label} config from {path}: {e}")
+
     return config
 
 
+@functools.lru_cache(maxsize=None)
 def get_model_name(provider: str, source_lang: str, target_lang: str, size: Optional[str] = None) -> str:
-    """Construct the appropriate model name based on the provider and languages."""
+    """Construct the appropriate model name based on the provider and languages.
+
+    Names are memoized, so resolving the model for every translated block is a single lookup.
+    """
     if provider not in MODEL_PROVIDERS:
         raise ValueError(f"Unknown model provider: {provider}")
     
@@ -91,127 +282,1569 @@ def get_model_name(provider: str, source_lang: str, target_lang: str, size: Opti
 
 
 def read_in_chunks(file_path: str, chunk_size: int = 2048) -> Generator[str, None, None]:
-    """Reads a file and yields chunks of a specified size, trying to respect line breaks."""
+    """Reads a file in large blocks and yields groups of whole lines of about chunk_size characters.
+
+    Chunks end at line ends, so sentence boundaries stay intact. A line longer than twice
+    chunk_size is cut at a sentence end or a space instead, so memory stays bounded for
+    input without line breaks.
+    """
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
-            buffer = ''
+            # Unyielded text from the previous block, at most 2 * chunk_size characters
+            rest = ''
             while True:
-                chunk = f.read(chunk_size)
-                if not chunk:
+                block = f.read(max(chunk_size, READ_BLOCK_SIZE))
+                if not block:
                     break
-                buffer += chunk
-                last_newline = buffer.rfind('\n')
-                if last_newline != -1:
-                    yield buffer[:last_newline + 1]
-                    buffer = buffer[last_newline + 1:]
-                elif len(buffer) > 2 * chunk_size:  # Avoid very long lines in buffer
-                    yield buffer[:chunk_size]
-                    buffer = buffer[chunk_size:]
-            yield buffer  # Yield any remaining text
+                text = rest + block
+                start = 0
+                while True:
+                    # Cut with str.find instead of iterating line by line: the first line end
+                    # at or after chunk_size characters closes a chunk
+                    end = text.find('\n', start + chunk_size - 1) + 1
+                    if not end or end - start > 2 * chunk_size:
+                        if len(text) - start <= 2 * chunk_size:
+                            break
+                        # Avoid very long lines in buffer
+                        end = long_line_cut(text, start, start + chunk_size)
+                    yield text[start:end]
+                    start = end
+                rest = text[start:]
+            yield rest  # Yield any remaining text
     except (FileNotFoundError, PermissionError, IOError, UnicodeDecodeError) as e:
         logging.error(f"Failed to read input file '{file_path}': {e}")
         sys.exit(1)
 
 
-def initialize_translator(model_name: str, provider: str, source_lang: str, target_lang: str) -> pipeline:
-    """Initialize the appropriate translation pipeline based on the provider."""
-    if provider == "facebook":
-        model = M2M100ForConditionalGeneration.from_pretrained(model_name)
-        tokenizer = M2M100Tokenizer.from_pretrained(model_name)
-        tokenizer.src_lang = source_lang
-        return pipeline("translation", model=model, tokenizer=tokenizer, device="cpu")
-    else:
-        return pipeline(
-            "translation",
-            model=model_name,
-            device="cpu",
+def long_line_cut(text: str, start: int, end: int) -> int:
+    """Return where to cut text[start:end] of an overlong line: after a sentence end, else a space."""
+    newline = text.rfind('\n', start, end)
+    if newline != -1:
+        return newline + 1
+    space = text.rfind(' ', start + 1, end)
+    if space == -1:
+        return end
+    # Sentence boundaries are followed by whitespace, so text without spaces needs no search
+    last_boundary = None
+    for last_boundary in SENTENCE_BOUNDARY.finditer(text, start + 1, end):
+        pass
+    return last_boundary.end() if last_boundary is not None else space + 1
+
+
+class Seq2SeqTranslator:
+    """Callable wrapper that runs tokenize, generate and decode directly on a seq2seq model.
+
+    Exposes the same interface as the transformers translation pipeline without its per-call
+    argument sanitizing and preprocessing overhead.
+    """
+
+    def __init__(
+        self,
+        model,
+        tokenizer,
+        forced_bos_token_id: Optional[int] = None,
+        cpu_autocast: bool = False,
+    ):
+        self.model = model
+        self.tokenizer = tokenizer
+        self.forced_bos_token_id = forced_bos_token_id
+        # Run bf16 models under CPU autocast, so ops without bf16 kernels fall back to fp32
+        self.cpu_autocast = cpu_autocast
+
+    def inference_context(self):
+        """Return the context manager that generation runs under."""
+        import torch
+
+        stack = contextlib.ExitStack()
+        stack.enter_context(torch.inference_mode())
+        if self.cpu_autocast:
+            stack.enter_context(torch.autocast("cpu", dtype=torch.bfloat16))
+        return stack
+
+    def __call__(
+        self,
+        text,
+        max_length: int = 512,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        **generate_kwargs,
+    ) -> List[Dict[str, str]]:
+        texts = [text] if isinstance(text, str) else list(text)
+        if "max_new_tokens" not in generate_kwargs:
+            generate_kwargs["max_length"] = max_length
+        if self.forced_bos_token_id is not None:
+            generate_kwargs["forced_bos_token_id"] = self.forced_bos_token_id
+        encoded = self.tokenizer(texts, truncation=True, max_length=max_length)["input_ids"]
+
+        # Batching texts of similar length keeps padding, and the compute spent on it, minimal
+        order = sorted(range(len(texts)), key=lambda i: len(encoded[i]))
+        translations: List[str] = [""] * len(texts)
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            inputs = self.tokenizer.pad(
+                {"input_ids": [encoded[i] for i in batch]}, return_tensors="pt"
+            ).to(self.model.device)
+            with self.inference_context():
+                outputs = self.model.generate(**inputs, **generate_kwargs)
+            for i, translation in zip(batch, self.tokenizer.batch_decode(outputs, skip_special_tokens=True)):
+                translations[i] = translation
+        return [{"translation_text": translation} for translation in translations]
+
+
+class CTranslate2Translator:
+    """Callable wrapper that exposes a CTranslate2 model through the pipeline interface."""
+
+    def __init__(
+        self,
+        model_dir: str,
+        tokenizer,
+        target_prefix: Optional[List[str]] = None,
+        device: str = "cpu",
+    ):
+        import ctranslate2
+
+        device, _, device_index = device.partition(":")
+        # Sub-batches run in parallel on inter_threads workers of up to 4 threads each;
+        # small Marian matrices stop scaling beyond a few threads per batch. An explicit
+        # --interop-threads instead shares all threads among its workers.
+        inter_threads = interop_thread_count()
+        if inter_threads:
+            intra_threads = max(1, thread_count() // inter_threads)
+        else:
+            inter_threads = max(1, thread_count() // CT2_INTRA_THREADS)
+            intra_threads = max(1, min(CT2_INTRA_THREADS, thread_count() // inter_threads))
+        self.translator = ctranslate2.Translator(
+            model_dir,
+            device=device,
+            device_index=int(device_index or 0),
+            # int8 weights; on GPUs the remaining layers run in fp16 instead of fp32
+            compute_type="int8_float16" if device == "cuda" else "int8",
+            inter_threads=inter_threads,
+            intra_threads=intra_threads,
         )
+        self.tokenizer = tokenizer
+        self.target_prefix = target_prefix
 
+    def __call__(
+        self,
+        text,
+        max_length: int = 512,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        num_beams: int = 1,
+        max_new_tokens: Optional[int] = None,
+        do_sample: bool = False,
+        **kwargs,
+    ) -> List[Dict[str, str]]:
+        texts = [text] if isinstance(text, str) else list(text)
+        batch = [
+            self.tokenizer.convert_ids_to_tokens(self.tokenizer.encode(t, truncation=True, max_length=max_length))
+            for t in texts
+        ]
+        target_prefix = [self.target_prefix] * len(batch) if self.target_prefix else None
+        results = self.translator.translate_batch(
+            batch,
+            target_prefix=target_prefix,
+            max_batch_size=batch_size,
+            beam_size=num_beams,
+            # 0 samples from the full distribution, 1 is greedy decoding
+            sampling_topk=0 if do_sample else 1,
+            max_decoding_length=max_new_tokens or max_length,
+            return_scores=False,
+        )
+        return [
+            {
+                "translation_text": self.tokenizer.decode(
+                    self.tokenizer.convert_tokens_to_ids(result.hypotheses[0]),
+                    skip_special_tokens=True,
+                )
+            }
+            for result in results
+        ]
 
-def translate_text(
-    text: str,
-    source_lang: str = "de",
-    target_lang: str = "en",
-    model_name: str = None,
-    provider: str = "helsinki",
-    model_size: str = None,
-    max_length: int = 512
-) -> str:
-    try:
-        from huggingface_hub import snapshot_download, model_info
-        import os
-
-        # Construct model name if not provided
-        if not model_name:
-            try:
-                model_name = get_model_name(provider, source_lang, target_lang, model_size)
-            except ValueError as e:
-                logging.error(str(e))
-                return None
-            
-        logging.debug(f"Constructed model name: {model_name}")
-        logging.info(f"Loading translation model: {model_name}...")
-
-        # Verify model exists on Hugging Face Hub
-        try:
-            info = model_info(model_name)
-            logging.debug(f"Model info retrieved: {info}")
-            if not info:
-                raise ValueError(f"Model '{model_name}' not found on Hugging Face Hub")
-        except Exception as e:
-            logging.error(f"Failed to verify model '{model_name}': {e}")
-            logging.error(f"The language pair {source_lang}->{target_lang} might not be supported.")
-            logging.error(f"Available providers: {', '.join(MODEL_PROVIDERS.keys())}")
-            return None
 
-        # Configure model caching and download settings
-        cache_dir = os.path.expanduser("~/.cache/huggingface/hub")
-        logging.debug(f"Using cache directory: {cache_dir}")
-        os.makedirs(cache_dir, exist_ok=True)
+def cached_artifact_dir(model_path: str, artifact: str) -> str:
+    """Return the directory for a derived model artifact, stored next to the Hugging Face snapshot.
+
+    The directory is keyed by the snapshot revision so updated models are converted again.
+    """
+    return os.path.join(
+        os.path.dirname(os.path.dirname(model_path)),
+        artifact,
+        os.path.basename(model_path),
+    )
+
+
+def load_model(
+    model_path: str,
+    model_class=None,
+    quantize: str = "none",
+    dtype: str = "fp32",
+    fast_attn: bool = True,
+    device: str = "cpu",
+):
+    """Load a seq2seq model in the requested precision, or with its Linear layers quantized to int8.
+
+    On the CPU int8 uses PyTorch's dynamic quantization; on CUDA the weights are loaded
+    in 8-bit with bitsandbytes. With fast_attn, attention uses PyTorch's fused
+    scaled_dot_product_attention kernel where the model supports it; otherwise the
+    reference (eager) attention implementation is used.
+    The quantized state dict is saved on first use and reloaded on later runs to skip the
+    quantize step; it is rebuilt when torch or transformers change or it cannot be loaded.
+    """
+    import torch
+    import transformers
+    from transformers import AutoModelForSeq2SeqLM
+
+    model_class = model_class or AutoModelForSeq2SeqLM
+
+    # Leaving the choice to transformers selects SDPA for every model that supports it
+    attn_implementation = None if fast_attn else "eager"
+    if quantize != "int8":
+        return model_class.from_pretrained(
+            model_path, torch_dtype=getattr(torch, DTYPES[dtype]), attn_implementation=attn_implementation
+        )
 
+    if device.startswith("cuda"):
+        from transformers import BitsAndBytesConfig
+
+        # bitsandbytes places the quantized weights itself, so the model must not be moved later
         try:
-            model_path = snapshot_download(
-                repo_id=model_name,
-                cache_dir=cache_dir,
-                local_files_only=False,
-                token=None,
+            return model_class.from_pretrained(
+                model_path,
+                quantization_config=BitsAndBytesConfig(load_in_8bit=True),
+                device_map={"": device},
+                attn_implementation=attn_implementation,
             )
-            logging.debug(f"Model downloaded to: {model_path}")
+        except ImportError as e:
+            raise ImportError(f"{e}. int8 on CUDA requires: pip install bitsandbytes accelerate")
+
+    if dtype != "fp32":
+        logging.warning(f"Dynamic int8 quantization requires fp32 weights, ignoring dtype '{dtype}'.")
+
+    # Quantized weights are packed for one kernel engine, and the attention implementation is
+    # part of the saved model, so the cache is kept per engine and attention implementation
+    engine = int8_engine()
+    torch.backends.quantized.engine = engine
+    attention = "sdpa" if fast_attn else "eager"
+    quantized_path = os.path.join(
+        cached_artifact_dir(model_path, f"torch-int8-{engine}-{attention}"), "quantized.pt"
+    )
+    # Packed int8 weights are only guaranteed to load into the versions that wrote them
+    versions = {"torch": str(torch.__version__), "transformers": transformers.__version__}
+    if os.path.exists(quantized_path):
+        try:
+            # Plain tensors only: unpickling arbitrary objects from the cache could run code
+            saved = torch.load(quantized_path, map_location="cpu", weights_only=True)
+            if saved.get("versions") == versions:
+                model = empty_quantized_model(model_path, attn_implementation)
+                model.load_state_dict(saved["state_dict"])
+                logging.debug(f"Using cached quantized model: {quantized_path}")
+                return model
+            logging.info("Cached int8 model was written by other torch/transformers versions, quantizing again...")
         except Exception as e:
-            logging.error(f"Failed to download model '{model_name}': {e}")
-            logging.error("Please check if the model name is correct and accessible.")
+            logging.warning(f"Could not load the cached int8 model ({e}), quantizing again...")
+
+    logging.info("Quantizing model to int8, this only happens once...")
+    model = model_class.from_pretrained(model_path, attn_implementation=attn_implementation)
+    model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    os.makedirs(os.path.dirname(quantized_path), exist_ok=True)
+    torch.save({"versions": versions, "state_dict": model.state_dict()}, quantized_path)
+    logging.debug(f"Quantized model written to: {quantized_path}")
+    return model
+
+
+def empty_quantized_model(model_path: str, attn_implementation: Optional[str] = None):
+    """Build a model with int8 Linear layers and uninitialized weights, ready for a quantized state dict."""
+    import torch
+    from transformers import AutoConfig, AutoModelForSeq2SeqLM, GenerationConfig
+    from transformers.modeling_utils import no_init_weights
+
+    with no_init_weights():
+        model = AutoModelForSeq2SeqLM.from_config(
+            AutoConfig.from_pretrained(model_path), attn_implementation=attn_implementation
+        )
+    try:
+        model.generation_config = GenerationConfig.from_pretrained(model_path)
+    except OSError:
+        # No generation_config.json: the defaults derived from the model config apply
+        pass
+    model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return model.eval()
+
+
+def convert_to_ctranslate2(model_path: str, quantization: str = "int8") -> str:
+    """Convert a downloaded model to CTranslate2 format, reusing a previous conversion if present."""
+    output_dir = cached_artifact_dir(model_path, f"ctranslate2-{quantization}")
+    if os.path.exists(os.path.join(output_dir, "model.bin")):
+        logging.debug(f"Using cached CTranslate2 model: {output_dir}")
+        return output_dir
+
+    try:
+        from ctranslate2.converters import TransformersConverter
+    except ImportError as e:
+        raise ImportError(f"{e}. The ctranslate2 backend requires: pip install ctranslate2")
+
+    logging.info(f"Converting model to CTranslate2 format ({quantization}), this only happens once...")
+    TransformersConverter(model_path).convert(output_dir, quantization=quantization, force=True)
+    logging.debug(f"CTranslate2 model written to: {output_dir}")
+    return output_dir
+
+
+def export_to_onnx(model_path: str) -> str:
+    """Export a downloaded model to ONNX with dynamic int8 quantization and graph optimization.
+
+    The result is cached next to the Hugging Face snapshot so the export only runs once.
+    """
+    output_dir = cached_artifact_dir(model_path, "onnx-int8")
+    if os.path.exists(os.path.join(output_dir, ONNX_ENCODER_FILE)):
+        logging.debug(f"Using cached ONNX model: {output_dir}")
+        return output_dir
+
+    try:
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM, ORTOptimizer, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig, OptimizationConfig
+    except ImportError as e:
+        raise ImportError(f"{e}. The onnxruntime backend requires: pip install optimum[onnxruntime]")
+
+    logging.info("Exporting model to ONNX with int8 quantization, this only happens once...")
+    if platform.machine().lower() in ("arm64", "aarch64"):
+        quantization_config = AutoQuantizationConfig.arm64(is_static=False, per_channel=False)
+    else:
+        quantization_config = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+
+    with tempfile.TemporaryDirectory() as export_dir, tempfile.TemporaryDirectory() as quantized_dir:
+        ORTModelForSeq2SeqLM.from_pretrained(model_path, export=True).save_pretrained(export_dir)
+
+        # Quantize before optimizing: the ONNX Runtime quantizer cannot infer tensor
+        # types on graphs that already contain fused (com.microsoft) operators.
+        for file_name in sorted(f for f in os.listdir(export_dir) if f.endswith(".onnx")):
+            quantizer = ORTQuantizer.from_pretrained(export_dir, file_name=file_name)
+            quantizer.quantize(save_dir=quantized_dir, quantization_config=quantization_config)
+
+        quantized_model = load_onnx_model(quantized_dir, suffix="_quantized")
+        optimizer = ORTOptimizer.from_pretrained(quantized_model)
+        optimizer.optimize(
+            save_dir=output_dir,
+            optimization_config=OptimizationConfig(optimization_level=99),
+        )
+
+    logging.debug(f"ONNX model written to: {output_dir}")
+    return output_dir
+
+
+def load_onnx_model(model_dir: str, suffix: str = "_quantized_optimized"):
+    """Load an exported encoder/decoder ONNX model pair from a directory.
+
+    Sessions run with all graph optimizations on the CPU execution provider. IO binding keeps
+    input and past key/value buffers in ONNX Runtime between decoder steps instead of copying
+    them through Python on every step.
+    """
+    import onnxruntime
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM
+
+    session_options = onnxruntime.SessionOptions()
+    session_options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+    session_options.execution_mode = onnxruntime.ExecutionMode.ORT_SEQUENTIAL
+    session_options.intra_op_num_threads = thread_count()
+
+    return ORTModelForSeq2SeqLM.from_pretrained(
+        model_dir,
+        encoder_file_name=f"encoder_model{suffix}.onnx",
+        decoder_file_name=f"decoder_model{suffix}.onnx",
+        decoder_with_past_file_name=f"decoder_with_past_model{suffix}.onnx",
+        provider="CPUExecutionProvider",
+        session_options=session_options,
+        use_io_binding=True,
+    )
+
+
+def find_cached_model(model_name: str, cache_dir: str = CACHE_DIR) -> Optional[str]:
+    """Return the local snapshot path of a fully downloaded model, without touching the network.
+
+    Models set up with --prefetch are found through their ready marker, without loading
+    huggingface_hub at all.
+    """
+    repo_dir = os.path.join(cache_dir, "models--" + model_name.replace("/", "--"))
+    if not os.path.isdir(repo_dir):
+        return None
+
+    marker_path = os.path.join(repo_dir, READY_MARKER)
+    if os.path.exists(marker_path):
+        with open(marker_path, "r", encoding="utf-8") as f:
+            model_path = f.read().strip()
+        if has_model_files(model_path):
+            return model_path
+
+    from huggingface_hub import try_to_load_from_cache
+
+    # A plain lookup of the cached config file, which also resolves the snapshot directory
+    config_path = try_to_load_from_cache(repo_id=model_name, filename="config.json", cache_dir=cache_dir)
+    if not isinstance(config_path, str):
+        return None
+    model_path = os.path.dirname(config_path)
+    # An interrupted download can leave the config without the weights; snapshot_download resumes it
+    return model_path if has_model_files(model_path) else None
+
+
+def has_model_files(model_path: str) -> bool:
+    """Return whether a snapshot holds the model config and all of its weight files."""
+    if not os.path.exists(os.path.join(model_path, "config.json")):
+        return False
+    if any(os.path.exists(os.path.join(model_path, name)) for name in WEIGHT_FILES):
+        return True
+    for name in WEIGHT_INDEX_FILES:
+        index_path = os.path.join(model_path, name)
+        if os.path.exists(index_path):
+            with open(index_path, "r", encoding="utf-8") as f:
+                shards = set(json.load(f).get("weight_map", {}).values())
+            return all(os.path.exists(os.path.join(model_path, shard)) for shard in shards)
+    return False
+
+
+def mark_model_ready(model_path: str) -> None:
+    """Record a downloaded snapshot as fully prepared, for the find_cached_model fast path."""
+    marker_path = os.path.join(os.path.dirname(os.path.dirname(model_path)), READY_MARKER)
+    with open(marker_path, "w", encoding="utf-8") as f:
+        f.write(model_path)
+    logging.debug(f"Wrote ready marker: {marker_path}")
+
+
+def get_tokenizer(model_path: str, source_lang: Optional[str] = None):
+    """Return the tokenizer for a model, loading it only once per process.
+
+    Tokenizers are shared by every translator built from the same model, independent of
+    backend and precision, so the vocabulary files are read a single time.
+    """
+    key = (model_path, source_lang)
+    if key not in _TOKENIZERS:
+        from transformers import AutoTokenizer
+
+        tokenizer = AutoTokenizer.from_pretrained(model_path, use_fast=True)
+        if not tokenizer.is_fast:
+            # Marian and M2M100 only ship SentencePiece tokenizers; blocks are still encoded in one call
+            logging.debug(f"No fast tokenizer for {model_path}, using {type(tokenizer).__name__}")
+        if source_lang:
+            tokenizer.src_lang = source_lang
+        _TOKENIZERS[key] = tokenizer
+    return _TOKENIZERS[key]
+
+
+@functools.lru_cache(maxsize=2)
+def initialize_translator(
+    model_name: str,
+    provider: str,
+    source_lang: str,
+    target_lang: str,
+    backend: str = "transformers",
+    quantize: str = "none",
+    dtype: str = "fp32",
+    fast_attn: bool = True,
+    device: str = "cpu",
+    compile_mode: str = "none",
+):
+    """Initialize the appropriate translator based on the provider and backend.
+
+    Loaded translators are cached, so repeated calls within one process reuse the warm model.
+    """
+    from transformers import M2M100ForConditionalGeneration
+
+    # M2M100 encodes the source language in the tokenizer and the target language as the
+    # first generated token, other models ignore both
+    tokenizer = get_tokenizer(model_name, source_lang if provider == "facebook" else None)
+
+    if backend == "ctranslate2":
+        # CTranslate2 runs on CPU or CUDA only
+        ct2_device = device if device.startswith("cuda") else "cpu"
+        target_prefix = [tokenizer.get_lang_token(target_lang)] if provider == "facebook" else None
+        return CTranslate2Translator(convert_to_ctranslate2(model_name), tokenizer, target_prefix, ct2_device)
+
+    forced_bos_token_id = tokenizer.get_lang_id(target_lang) if provider == "facebook" else None
+    if backend == "onnxruntime":
+        model = load_onnx_model(export_to_onnx(model_name))
+        return Seq2SeqTranslator(model, tokenizer, forced_bos_token_id)
+
+    model_class = M2M100ForConditionalGeneration if provider == "facebook" else None
+    model = load_model(model_name, model_class, quantize, dtype, fast_attn, device)
+    # An explicit fp32 is kept on GPUs: some models (mT5, NLLB) overflow to NaN in fp16.
+    # --dtype auto already resolved to fp16 there, and the weights were loaded in it.
+    if device == "cpu" and dtype == "fp16":
+        logging.warning("fp16 is slow on most CPUs; consider --dtype bf16 for reduced precision on the CPU.")
+    elif device == "cpu" and quantize != "int8":
+        model = optimize_for_cpu(model, dtype)
+    if compile_mode == "torch":
+        compile_model(model, quantize)
+    cpu_autocast = device == "cpu" and dtype == "bf16" and quantize != "int8"
+    # bitsandbytes int8 models are placed on their GPU when loaded and cannot be moved
+    if not (quantize == "int8" and device.startswith("cuda")):
+        model = model.to(device)
+    return Seq2SeqTranslator(model, tokenizer, forced_bos_token_id, cpu_autocast)
+
+
+def optimize_for_cpu(model, dtype: str = "fp32"):
+    """Fuse attention and feed-forward ops into oneDNN kernels with Intel Extension for PyTorch.
+
+    Only applies on x86_64 hosts with intel_extension_for_pytorch installed; otherwise the
+    model is returned unchanged.
+    """
+    if platform.machine().lower() not in ("x86_64", "amd64"):
+        return model
+    try:
+        import intel_extension_for_pytorch as ipex
+    except ImportError:
+        return model
+
+    import torch
+
+    logging.debug("Optimizing model with Intel Extension for PyTorch")
+    ipex_dtype = torch.bfloat16 if dtype == "bf16" else None
+    return ipex.optimize(model.eval(), dtype=ipex_dtype, level="O1", inplace=True)
+
+
+def compile_model(model, quantize: str = "none") -> None:
+    """Compile the model's forward pass with TorchInductor, in place.
+
+    Compiled kernels are cached on disk, so the compilation cost is paid once per model and
+    input shape rather than on every run.
+    """
+    import torch
+
+    if tuple(int(part) for part in torch.__version__.split(".")[:2]) < (2, 1):
+        logging.warning(f"torch.compile requires PyTorch 2.1 or newer (found {torch.__version__}), skipping.")
+        return
+    if quantize == "int8":
+        logging.warning("torch.compile is not supported for int8 quantized models, skipping.")
+        return
+
+    import torch._inductor.config
+
+    torch._inductor.config.fx_graph_cache = True
+
+    # Compiling forward (not the module) keeps the model a PreTrainedModel for generate()
+    model.forward = torch.compile(model.forward, mode="reduce-overhead", dynamic=True)
+    logging.debug(f"Compiled model forward pass, kernel cache: {os.environ['TORCHINDUCTOR_CACHE_DIR']}")
+
+
+def parse_device(value: str) -> str:
+    """Parse a --device value: a device name, 'cuda:N', or a GPU index (-1 for the CPU)."""
+    if value in DEVICES or re.fullmatch(r"cuda:\d+", value):
+        return value
+    try:
+        index = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"invalid device '{value}' (choose from {', '.join(DEVICES)}, cuda:N or a GPU index)"
+        )
+    return "cpu" if index < 0 else f"cuda:{index}"
+
+
+@functools.lru_cache(maxsize=1)
+def cpu_flags() -> Optional[frozenset]:
+    """Return the CPU feature flags from /proc/cpuinfo, or None where it is not available."""
+    try:
+        with open("/proc/cpuinfo", "r") as f:
+            cpuinfo = f.read()
+    except OSError:
+        return None
+    flags = set()
+    for line in cpuinfo.splitlines():
+        # x86 lists its features under 'flags', ARM under 'Features'
+        if line.startswith(("flags", "Features")):
+            flags.update(line.partition(":")[2].split())
+    return frozenset(flags)
+
+
+@functools.lru_cache(maxsize=1)
+def int8_engine() -> Optional[str]:
+    """Return the quantized kernel engine for this CPU, or None if int8 would not be faster.
+
+    On x86 the int8 kernels only beat fp32 with VNNI dot-product instructions (AVX-512 VNNI,
+    AVX-VNNI or AMX); ARM CPUs use QNNPACK.
+    """
+    import torch
+
+    engines = torch.backends.quantized.supported_engines
+    if platform.machine().lower() in ("x86_64", "amd64"):
+        flags = cpu_flags()
+        # No CPU flags to check (macOS, Windows), assume a recent CPU
+        if flags is not None and not flags & {"avx512_vnni", "avx_vnni", "amx_int8"}:
+            logging.warning("This CPU lacks VNNI int8 instructions, running without int8 quantization.")
             return None
+        return "x86" if "x86" in engines else "fbgemm"
+    if "qnnpack" in engines:
+        return "qnnpack"
+    logging.warning("No int8 kernels available for this CPU, running without int8 quantization.")
+    return None
 
-        # Initialize the appropriate translation pipeline
-        translator = initialize_translator(model_path, provider, source_lang, target_lang)
 
-        logging.info("Model loaded. Starting translation...")
-        logging.debug(f"Translating text with max length: {max_length}")
+def resolve_device(device: str = "auto", quantize: str = "none") -> str:
+    """Resolve the 'auto' device to the fastest available one: CUDA, then Apple MPS, then CPU."""
+    if quantize == "int8":
+        # An explicit CUDA device loads 8-bit weights with bitsandbytes; otherwise the
+        # dynamically quantized CPU kernels are used
+        if device.startswith("cuda"):
+            return device
+        if device not in ("auto", "cpu"):
+            logging.warning(f"int8 quantization only runs on the CPU or CUDA, ignoring device '{device}'.")
+        return "cpu"
+    if device == "auto":
+        import torch
 
-        # Perform translation with configurable max_length
-        if provider == "facebook":
-            results = translator(text, max_length=max_length, src_lang=source_lang, tgt_lang=target_lang)
+        if torch.cuda.is_available():
+            device = "cuda"
+        elif torch.backends.mps.is_available():
+            device = "mps"
         else:
-            results = translator(text, max_length=max_length)
+            device = "cpu"
+    if device == "cuda":
+        import torch
 
-        if results and isinstance(results, list) and "translation_text" in results[0]:
-            translated_text = results[0]["translation_text"]
-            logging.info("Translation successful.")
-            logging.debug(f"Translated text: '{translated_text}'")
-            return translated_text
+        # The current GPU, which worker processes set to spread out over all GPUs
+        device = f"cuda:{torch.cuda.current_device()}"
+    return device
+
+
+def resolve_dtype(dtype: str = "auto", device: str = "cpu", quantize: str = "none") -> str:
+    """Resolve the 'auto' precision for a device: FP16 on GPUs, BF16 on CPUs with native BF16, else FP32."""
+    if dtype != "auto":
+        return dtype
+    if quantize == "int8":
+        return "fp32"
+    if device.startswith("cuda") or device == "mps":
+        return "fp16"
+
+    import torch
+
+    flags = cpu_flags() or frozenset()
+    if torch.backends.mkldnn.is_available() and flags & {"avx512_bf16", "amx_bf16", "bf16"}:
+        return "bf16"
+    return "fp32"
+
+
+@functools.lru_cache(maxsize=None)
+def resolve_precision(device: str, dtype: str, quantize: str, backend: str) -> Tuple[str, str, str]:
+    """Return the device, dtype and quantization a model actually runs with for these options."""
+    device = resolve_device(device, quantize)
+    if backend == "transformers" and quantize == "int8" and device == "cpu" and not int8_engine():
+        quantize = "none"
+    dtype = resolve_dtype(dtype, device, quantize)
+    logging.debug("Using device: %s, dtype: %s", device, dtype)
+    return device, dtype, quantize
+
+
+def physical_cores() -> Optional[List[List[int]]]:
+    """Return the CPUs available to this process grouped by physical core, or None where unknown."""
+    try:
+        cpus = sorted(os.sched_getaffinity(0))
+    except AttributeError:
+        # No affinity or topology information (macOS, Windows)
+        return None
+
+    cores: Dict[str, List[int]] = {}
+    for cpu in cpus:
+        try:
+            with open(f"/sys/devices/system/cpu/cpu{cpu}/topology/thread_siblings_list") as f:
+                cores.setdefault(f.read().strip(), []).append(cpu)
+        except OSError:
+            return [[cpu] for cpu in cpus]
+    return list(cores.values()) or [[cpu] for cpu in cpus]
+
+
+def physical_core_count() -> int:
+    """Return the number of physical cores available to this process, ignoring SMT siblings."""
+    cores = physical_cores()
+    return len(cores) if cores is not None else os.cpu_count() or 1
+
+
+def thread_count() -> int:
+    """Return the number of compute threads to use, as configured by configure_thread_env."""
+    try:
+        return max(1, int(os.environ["OMP_NUM_THREADS"]))
+    except (KeyError, ValueError):
+        return physical_core_count()
+
+
+def interop_thread_count() -> Optional[int]:
+    """Return the --interop-threads setting, or None to use each backend's default."""
+    try:
+        return max(1, int(os.environ[INTEROP_THREADS_ENV]))
+    except (KeyError, ValueError):
+        return None
+
+
+def configure_thread_env(num_threads: Optional[int] = None, interop_threads: Optional[int] = None) -> None:
+    """Set OpenMP/MKL threading before torch is imported, which is when they read it.
+
+    Rayon, which runs batch encoding in the fast (Rust) tokenizers, gets the same thread count.
+    Defaults to one thread per physical core: SMT siblings share execution units, so extra
+    threads only contend during decoding. Explicit num_threads overrides the environment.
+    """
+    threads = str(num_threads or physical_core_count())
+    for name in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "RAYON_NUM_THREADS"):
+        if num_threads:
+            os.environ[name] = threads
         else:
-            logging.error(f"Translation failed. Unexpected result format: {results}")
+            os.environ.setdefault(name, threads)
+    os.environ.setdefault("KMP_AFFINITY", "granularity=fine,compact,1,0")
+    if interop_threads:
+        os.environ[INTEROP_THREADS_ENV] = str(interop_threads)
+
+
+def configure_torch_threads(num_threads: Optional[int] = None) -> None:
+    """Configure PyTorch CPU threading before the model is loaded.
+
+    Unless --interop-threads is given, a single inter-op thread avoids oversubscribing cores
+    that the intra-op pool already uses.
+    """
+    import torch
+
+    torch.set_num_threads(num_threads or thread_count())
+    try:
+        torch.set_num_interop_threads(interop_thread_count() or 1)
+    except RuntimeError as e:
+        # Can only be set once, before any inter-op parallel work has started
+        logging.debug(f"Could not set inter-op threads: {e}")
+
+
+@functools.lru_cache(maxsize=4)
+def get_sentence_segmenter(language: str):
+    """Return a pysbd sentence segmenter for the language, or None if pysbd cannot be used."""
+    try:
+        import pysbd
+
+        return pysbd.Segmenter(language=language, clean=False)
+    except ImportError:
+        logging.debug("pysbd not installed, using simple sentence splitting.")
+    except ValueError:
+        logging.debug(f"pysbd does not support language '{language}', using simple sentence splitting.")
+    return None
+
+
+def split_sentences(text: str, language: str) -> List[str]:
+    """Split a line of text into sentences."""
+    segmenter = get_sentence_segmenter(language)
+    sentences = segmenter.segment(text) if segmenter else SENTENCE_BOUNDARY.split(text)
+    return [sentence.strip() for sentence in sentences if sentence.strip()]
+
+
+def translate_segments(
+    text: str,
+    translate_fn: Callable[[List[str]], Optional[List[str]]],
+    language: str,
+) -> Optional[str]:
+    """Translate text as one batch of sentences, preserving line and paragraph breaks.
+
+    Short sentences keep each decoder run short and batch well, instead of running the whole
+    text through the model as one long (and possibly truncated) sequence.
+    """
+    lines = text.split("\n")
+    line_sentences = [split_sentences(line, language) if line.strip() else [] for line in lines]
+    sentences = [sentence for sentences in line_sentences for sentence in sentences]
+    if not sentences:
+        return text
+
+    translations = translate_fn(sentences)
+    if translations is None:
+        return None
+
+    translated = iter(translations)
+    result = "\n".join(
+        " ".join(next(translated) for _ in sentences) if sentences else line
+        for line, sentences in zip(lines, line_sentences)
+    )
+    # An overlong line cut by read_in_chunks continues in the next block; keep the space between them
+    if lines[-1].strip() and lines[-1][-1].isspace():
+        result += " "
+    return result
+
+
+def split_by_tokens(text: str, tokenizer, max_tokens: int) -> List[str]:
+    """Split text at word boundaries into pieces of at most max_tokens tokens each.
+
+    Works with slow tokenizers too (Marian has no fast one), so it counts tokens per word
+    instead of relying on offset mappings. A single word longer than max_tokens stays whole.
+    """
+    words = text.split()
+    counts = [len(ids) for ids in tokenizer(words, add_special_tokens=False)["input_ids"]]
+    if sum(counts) <= max_tokens:
+        return [text]
+
+    pieces: List[str] = []
+    piece: List[str] = []
+    piece_tokens = 0
+    for word, count in zip(words, counts):
+        if piece and piece_tokens + count > max_tokens:
+            pieces.append(" ".join(piece))
+            piece, piece_tokens = [], 0
+        piece.append(word)
+        piece_tokens += count
+    pieces.append(" ".join(piece))
+    logging.debug("Split a text of %d tokens into %d pieces", sum(counts), len(pieces))
+    return pieces
+
+
+def resolve_model_path(
+    model_name: Optional[str],
+    provider: str,
+    source_lang: str,
+    target_lang: str,
+    model_size: Optional[str] = None,
+    hf_token: Optional[str] = None,
+) -> Optional[str]:
+    """Return the local snapshot path of the model, downloading it first if needed.
+
+    Resolved paths are remembered, so translating many blocks with one model looks it up once.
+    """
+    # Construct model name if not provided
+    if not model_name:
+        try:
+            model_name = get_model_name(provider, source_lang, target_lang, model_size)
+        except ValueError as e:
+            logging.error(str(e))
+            return None
+
+    if model_name in _MODEL_PATHS:
+        return _MODEL_PATHS[model_name]
+
+    logging.debug(f"Constructed model name: {model_name}")
+    logging.info(f"Loading translation model: {model_name}...")
+
+    # A fully cached model needs no network round-trips
+    logging.debug(f"Using cache directory: {CACHE_DIR}")
+    model_path = find_cached_model(model_name)
+    if model_path:
+        logging.debug(f"Using cached model: {model_path}")
+    elif HF_HUB_OFFLINE:
+        logging.error(f"Model '{model_name}' is not in the cache at {CACHE_DIR} and HF_HUB_OFFLINE is set.")
+        return None
+    else:
+        model_path = download_model(model_name, source_lang, target_lang, hf_token)
+        if not model_path:
             return None
 
+    _MODEL_PATHS[model_name] = model_path
+    return model_path
+
+
+def download_model(
+    model_name: str, source_lang: str, target_lang: str, hf_token: Optional[str] = None
+) -> Optional[str]:
+    """Download a model from the Hugging Face Hub and return its snapshot path.
+
+    Without an explicit token, HF_TOKEN or the token saved by `huggingface-cli login` is used.
+    """
+    from huggingface_hub import snapshot_download
+    from huggingface_hub.utils import HFValidationError, RepositoryNotFoundError
+
+    # snapshot_download reports unknown models itself, no separate model_info request needed
+    try:
+        model_path = snapshot_download(
+            repo_id=model_name,
+            cache_dir=CACHE_DIR,
+            local_files_only=False,
+            token=hf_token,
+            # Fetch the model's files in parallel
+            max_workers=DOWNLOAD_WORKERS,
+        )
+        logging.debug(f"Model downloaded to: {model_path}")
+    except (RepositoryNotFoundError, HFValidationError) as e:
+        logging.error(f"Model '{model_name}' not found on Hugging Face Hub: {e}")
+        logging.error(f"The language pair {source_lang}->{target_lang} might not be supported.")
+        logging.error(f"Available providers: {', '.join(MODEL_PROVIDERS.keys())}")
+        return None
+    except Exception as e:
+        logging.error(f"Failed to download model '{model_name}': {e}")
+        logging.error("Please check if the model name is correct and accessible.")
+        return None
+    return model_path
+
+
+def load_translator(
+    model_name: Optional[str] = None,
+    provider: str = "helsinki",
+    source_lang: str = "de",
+    target_lang: str = "en",
+    model_size: Optional[str] = None,
+    backend: str = "transformers",
+    quantize: str = "none",
+    dtype: str = "fp32",
+    fast_attn: bool = True,
+    device: str = "auto",
+    compile_mode: str = "none",
+    hf_token: Optional[str] = None,
+) -> Optional[Callable]:
+    """Return a ready translator for the model, downloading and loading it on first use.
+
+    Translators are cached, so this is cheap after the first call with the same settings.
+    """
+    try:
+        model_path = resolve_model_path(model_name, provider, source_lang, target_lang, model_size, hf_token)
+        if not model_path:
+            return None
+
+        device, dtype, quantize = resolve_precision(device, dtype, quantize, backend)
+        return initialize_translator(
+            model_path,
+            provider,
+            source_lang,
+            target_lang,
+            backend,
+            quantize,
+            dtype,
+            fast_attn,
+            device,
+            compile_mode,
+        )
+
     except ImportError as e:
         logging.error(f"ImportError: {e}. Make sure required packages are installed.")
         logging.error("Try running: pip install torch transformers sacremoses protobuf huggingface_hub")
         sys.exit(1)
+    except Exception as e:
+        logging.error(f"An error occurred while loading the model: {e}")
+        return None
+
+
+def translate_with(
+    translator: Callable,
+    texts: List[str],
+    max_length: int = 512,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    num_beams: int = 1,
+    max_new_tokens: Optional[int] = None,
+    do_sample: bool = False,
+) -> Optional[List[str]]:
+    """Translate a list of texts with a loaded translator, running them through it in batches."""
+    try:
+        # Runs once per block: %-style arguments are only formatted when debug logging is on
+        logging.debug("Translating %d text(s) with max length: %d, batch size: %d", len(texts), max_length, batch_size)
+
+        # Greedy decoding by default: beam search cost grows with the number of beams
+        generate_kwargs = {"num_beams": num_beams, "do_sample": do_sample, "use_cache": True}
+        if num_beams > 1:
+            generate_kwargs["early_stopping"] = True
+        if max_new_tokens:
+            generate_kwargs["max_new_tokens"] = max_new_tokens
+        logging.debug("Generation settings: %s", generate_kwargs)
+
+        # Texts longer than the model input are split instead of silently truncated.
+        # Two tokens are left for the special tokens the tokenizer adds.
+        pieces: List[str] = []
+        owners: List[int] = []
+        for index, text in enumerate(texts):
+            for piece in split_by_tokens(text, translator.tokenizer, max_length - 2):
+                pieces.append(piece)
+                owners.append(index)
+
+        # Perform translation with configurable max_length
+        results = translator(pieces, max_length=max_length, batch_size=batch_size, **generate_kwargs)
+
+        if (
+            results
+            and isinstance(results, list)
+            and len(results) == len(pieces)
+            and all("translation_text" in result for result in results)
+        ):
+            parts: List[List[str]] = [[] for _ in texts]
+            for index, result in zip(owners, results):
+                parts[index].append(result["translation_text"])
+            translations = [" ".join(part) for part in parts]
+            logging.info("Translation successful.")
+            logging.debug("Translated texts: %s", translations)
+            return translations
+        else:
+            logging.error(f"Translation failed. Unexpected result format: {results}")
+            return None
+
     except Exception as e:
         logging.error(f"An error occurred during translation: {e}")
         return None
 
 
+def translate_texts(
+    texts: List[str],
+    source_lang: str = "de",
+    target_lang: str = "en",
+    model_name: str = None,
+    provider: str = "helsinki",
+    model_size: str = None,
+    max_length: int = 512,
+    backend: str = "transformers",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    quantize: str = "none",
+    dtype: str = "fp32",
+    fast_attn: bool = True,
+    num_beams: int = 1,
+    max_new_tokens: Optional[int] = None,
+    device: str = "auto",
+    compile_mode: str = "none",
+    do_sample: bool = False,
+    hf_token: Optional[str] = None,
+    translation_cache: str = "memory",
+) -> Optional[List[str]]:
+    """Translate a list of texts, loading the model on first use.
+
+    Texts already translated with the same settings are taken from the translation cache,
+    and repeated texts are translated once. Sampled translations are never cached.
+    """
+    if do_sample:
+        translation_cache = "none"
+    settings = None
+    if translation_cache != "none":
+        # Keyed by the snapshot path, which pins the model revision, and by the precision the model
+        # actually runs with, so an updated model or a different 'auto' choice is not served stale
+        model_path = resolve_model_path(model_name, provider, source_lang, target_lang, model_size, hf_token)
+        if not model_path:
+            return None
+        _, run_dtype, run_quantize = resolve_precision(device, dtype, quantize, backend)
+        settings = repr((
+            model_path, provider, source_lang, target_lang, backend,
+            run_quantize, run_dtype, max_length, num_beams, max_new_tokens,
+        ))
+    found = cached_translations(settings, texts, translation_cache)
+    missing = [text for text in dict.fromkeys(texts) if text not in found]
+    if not missing:
+        return [found[text] for text in texts]
+
+    translator = load_translator(
+        model_name,
+        provider,
+        source_lang,
+        target_lang,
+        model_size,
+        backend,
+        quantize,
+        dtype,
+        fast_attn,
+        device,
+        compile_mode,
+        hf_token,
+    )
+    if translator is None:
+        return None
+    translations = translate_with(translator, missing, max_length, batch_size, num_beams, max_new_tokens, do_sample)
+    if translations is None:
+        return None
+    found.update(zip(missing, translations))
+    store_translations(settings, dict(zip(missing, translations)), translation_cache)
+    return [found[text] for text in texts]
+
+
+@functools.lru_cache(maxsize=1)
+def translation_db(path: str = TRANSLATION_CACHE_PATH):
+    """Open the persistent translation cache, creating it on first use."""
+    import sqlite3
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Worker processes share the database; the timeout makes them wait for each other's writes
+    db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    db.execute(
+        "CREATE TABLE IF NOT EXISTS translations "
+        "(settings TEXT, content TEXT, translation TEXT, PRIMARY KEY (settings, content))"
+    )
+    return db
+
+
+def cached_translations(settings: Optional[str], texts: List[str], translation_cache: str = "memory") -> Dict[str, str]:
+    """Return the cached translations of texts, keyed by source text."""
+    found: Dict[str, str] = {}
+    if translation_cache == "none":
+        return found
+    for text in texts:
+        key = (settings, text)
+        if key in _TRANSLATIONS:
+            _TRANSLATIONS.move_to_end(key)
+            found[text] = _TRANSLATIONS[key]
+
+    if translation_cache == "disk":
+        from_disk = {}
+        db = translation_db()
+        for text in dict.fromkeys(texts):
+            if text in found:
+                continue
+            row = db.execute(
+                "SELECT translation FROM translations WHERE settings = ? AND content = ?", (settings, text)
+            ).fetchone()
+            if row:
+                from_disk[text] = row[0]
+        found.update(from_disk)
+        store_translations(settings, from_disk, "memory")
+    return found
+
+
+def store_translations(
+    settings: Optional[str], translations: Dict[str, str], translation_cache: str = "memory"
+) -> None:
+    """Add translations to the cache, evicting the least recently used ones beyond its size."""
+    if translation_cache == "none":
+        return
+    for text, translation in translations.items():
+        _TRANSLATIONS[(settings, text)] = translation
+        _TRANSLATIONS.move_to_end((settings, text))
+    while len(_TRANSLATIONS) > TRANSLATION_CACHE_SIZE:
+        _TRANSLATIONS.popitem(last=False)
+
+    if translation_cache == "disk" and translations:
+        db = translation_db()
+        with db:
+            db.executemany(
+                "INSERT OR REPLACE INTO translations (settings, content, translation) VALUES (?, ?, ?)",
+                [(settings, text, translation) for text, translation in translations.items()],
+            )
+            # Replaced rows get a new rowid, so the highest rowids are the most recently stored
+            db.execute(
+                "DELETE FROM translations WHERE rowid <= (SELECT MAX(rowid) FROM translations) - ?",
+                (TRANSLATION_DB_MAX_ROWS,),
+            )
+
+
+def translate_text(
+    text: str,
+    source_lang: str = "de",
+    target_lang: str = "en",
+    model_name: str = None,
+    provider: str = "helsinki",
+    model_size: str = None,
+    max_length: int = 512,
+    backend: str = "transformers",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    quantize: str = "none",
+    dtype: str = "fp32",
+    fast_attn: bool = True,
+    num_beams: int = 1,
+    max_new_tokens: Optional[int] = None,
+    device: str = "auto",
+    compile_mode: str = "none",
+    do_sample: bool = False,
+    hf_token: Optional[str] = None,
+    translation_cache: str = "memory",
+) -> str:
+    """Translate a single text, splitting it into sentences that are translated as one batch."""
+    return translate_segments(
+        text,
+        lambda sentences: translate_texts(
+            sentences,
+            source_lang=source_lang,
+            target_lang=target_lang,
+            model_name=model_name,
+            provider=provider,
+            model_size=model_size,
+            max_length=max_length,
+            backend=backend,
+            batch_size=batch_size,
+            quantize=quantize,
+            dtype=dtype,
+            fast_attn=fast_attn,
+            num_beams=num_beams,
+            max_new_tokens=max_new_tokens,
+            device=device,
+            compile_mode=compile_mode,
+            do_sample=do_sample,
+            hf_token=hf_token,
+            translation_cache=translation_cache,
+        ),
+        source_lang,
+    )
+
+
+def translation_options(args: argparse.Namespace) -> Dict:
+    """Collect the translate_text keyword arguments from parsed command-line arguments."""
+    return {
+        "source_lang": args.source_lang,
+        "target_lang": args.target_lang,
+        "model_name": args.model,
+        "provider": args.provider,
+        "model_size": args.model_size,
+        "max_length": args.max_length,
+        "backend": args.backend,
+        "batch_size": args.batch_size,
+        "quantize": args.quantize,
+        "dtype": args.dtype,
+        "fast_attn": args.fast_attn,
+        "num_beams": args.beams,
+        "max_new_tokens": args.max_new_tokens,
+        "device": args.device,
+        "compile_mode": args.compile,
+        "do_sample": args.do_sample,
+        "hf_token": args.hf_token,
+        "translation_cache": args.translation_cache,
+    }
+
+
+def run_daemon(socket_path: str = DAEMON_SOCKET_PATH) -> None:
+    """Serve translation requests on a unix socket, keeping loaded models warm between requests."""
+    from multiprocessing.connection import Listener
+
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+
+    # Requests are pickled, so only the current user may connect to the socket
+    old_umask = os.umask(0o177)
+    try:
+        listener = Listener(socket_path, family="AF_UNIX")
+    finally:
+        os.umask(old_umask)
+
+    configure_torch_threads()
+    logging.info(f"Translation daemon listening on: {socket_path}")
+    with listener:
+        while True:
+            with listener.accept() as conn:
+                try:
+                    request = conn.recv()
+                except EOFError:
+                    continue
+                if request is None:
+                    logging.info("Translation daemon shutting down.")
+                    conn.send(None)
+                    break
+                conn.send(translate_texts(**request))
+
+
+def spawn_daemon(socket_path: str = DAEMON_SOCKET_PATH, timeout: float = 10.0) -> bool:
+    """Fork a detached translation daemon and wait until its socket is available."""
+    if not hasattr(os, "fork"):
+        logging.warning("Background daemon is not supported on this platform. Translating in-process.")
+        return False
+
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+
+    pid = os.fork()
+    if pid == 0:
+        os.setsid()
+        devnull = os.open(os.devnull, os.O_RDWR)
+        for fd in (0, 1, 2):
+            os.dup2(devnull, fd)
+        try:
+            run_daemon(socket_path)
+        finally:
+            os._exit(0)
+
+    logging.info(f"Started translation daemon (pid {pid}).")
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if os.path.exists(socket_path):
+            return True
+        time.sleep(0.05)
+    logging.warning("Translation daemon did not start in time. Translating in-process.")
+    return False
+
+
+def translate_via_daemon(
+    texts: List[str], options: Dict, socket_path: str = DAEMON_SOCKET_PATH
+) -> Optional[List[str]]:
+    """Send a translation request to the background daemon, starting it on first use."""
+    from multiprocessing.connection import Client
+
+    for attempt in range(2):
+        try:
+            with Client(socket_path, family="AF_UNIX") as conn:
+                conn.send(dict(options, texts=texts))
+                return conn.recv()
+        except (FileNotFoundError, ConnectionRefusedError):
+            if attempt or not spawn_daemon(socket_path):
+                break
+    return translate_texts(texts, **options)
+
+
+def stop_daemon(socket_path: str = DAEMON_SOCKET_PATH) -> bool:
+    """Ask a running translation daemon to shut down."""
+    from multiprocessing.connection import Client
+
+    try:
+        with Client(socket_path, family="AF_UNIX") as conn:
+            conn.send(None)
+            conn.recv()
+        return True
+    except (FileNotFoundError, ConnectionRefusedError, EOFError):
+        return False
+
+
+def translate(texts: List[str], args: argparse.Namespace) -> Optional[List[str]]:
+    """Translate texts with the command-line settings, through the daemon if requested."""
+    options = translation_options(args)
+    if args.daemon:
+        return translate_via_daemon(texts, options)
+    return translate_texts(texts, **options)
+
+
+def translate_lines(text: str, args: argparse.Namespace) -> Optional[str]:
+    """Translate multi-line text sentence by sentence in batches, preserving line structure."""
+    return translate_segments(text, lambda sentences: translate(sentences, args), args.source_lang)
+
+
+def group_blocks(
+    pieces: Iterable[str], chunk_size: int, max_lines: Optional[int] = None
+) -> Generator[str, None, None]:
+    """Join streamed pieces of whole lines into blocks of at least chunk_size characters.
+
+    With max_lines, blocks are instead closed once they hold that many lines.
+    """
+    if max_lines:
+        # File input arrives in chunks of many lines, so blocks are closed line by line
+        pieces = (line for piece in pieces for line in piece.splitlines(keepends=True))
+    buffer: List[str] = []
+    buffered = 0
+    for piece in pieces:
+        buffer.append(piece)
+        buffered += piece.count("\n") if max_lines else len(piece)
+        if buffered >= (max_lines or chunk_size):
+            yield "".join(buffer)
+            buffer, buffered = [], 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def read_ahead(items: Iterable[str], depth: int = READ_AHEAD_BLOCKS) -> Generator[str, None, None]:
+    """Yield items produced by a background reader thread, up to depth items ahead of the consumer.
+
+    Reading releases the GIL, as does inference in PyTorch, so input I/O overlaps with translation.
+    An error in the reader is raised in the consumer once the items before it are consumed.
+    """
+    import queue
+
+    done = object()
+    buffer: "queue.Queue" = queue.Queue(maxsize=depth)
+
+    def produce() -> None:
+        try:
+            for item in items:
+                buffer.put(item)
+        except BaseException as e:
+            buffer.put(e)
+        buffer.put(done)
+
+    # A daemon thread, so a reader blocked on stdin never keeps the process alive
+    threading.Thread(target=produce, name="read-ahead", daemon=True).start()
+    while True:
+        item = buffer.get()
+        if item is done:
+            return
+        if isinstance(item, BaseException):
+            raise item
+        yield item
+
+
+def translate_stream(
+    pieces: Iterable[str], args: argparse.Namespace, chunk_size: int = STREAM_CHUNK_SIZE, executor=None
+) -> Generator[Optional[str], None, None]:
+    """Translate streamed text in blocks of whole lines, yielding each block as soon as it is done.
+
+    Memory use stays constant for arbitrarily large inputs, and output starts after the first
+    block instead of after the whole input has been read. Yields None if a block fails.
+    With an executor from start_workers, the blocks are translated in its worker processes.
+    """
+    # Larger batches need larger blocks to fill them. All sentences of a block are sorted by
+    # length before batching, so larger blocks (--bucket-window) also mean less padding.
+    blocks = read_ahead(
+        group_blocks(pieces, chunk_size * max(1, args.batch_size // DEFAULT_BATCH_SIZE), args.bucket_window)
+    )
+    if executor is not None:
+        yield from translate_in_workers(blocks, args, executor)
+    else:
+        for block in blocks:
+            yield translate_lines(block, args)
+
+
+def init_worker(
+    num_threads: int, log_level: int, log_format: str, device: str, workers: int, worker_count
+) -> None:
+    """Set up a worker process: the parent's logging, its own CPU cores and threads, and its GPU.
+
+    Each worker is pinned to its own slice of the physical cores, so the workers' thread pools
+    do not compete for the same cores. With several GPUs and an 'auto' or 'cuda' device, the
+    workers are assigned to the GPUs in turn, so each GPU translates its own share of the blocks.
+    """
+    logging.basicConfig(level=log_level, format=log_format, force=True)
+    logging.getLogger("transformers").setLevel(logging.ERROR)
+    with worker_count.get_lock():
+        index = worker_count.value
+        worker_count.value += 1
+
+    # Before torch starts its thread pools, which inherit the process affinity
+    cores = physical_cores()
+    if cores and hasattr(os, "sched_setaffinity"):
+        share = max(1, len(cores) // workers)
+        start = index % max(1, len(cores) // share) * share
+        cpus = [cpu for core in cores[start:start + share] for cpu in core]
+        os.sched_setaffinity(0, cpus)
+        logging.debug(f"Worker {index} runs on CPUs {cpus}")
+    configure_thread_env(num_threads)
+    # The parent's compact KMP_AFFINITY would bind every worker's threads to the same first cores
+    os.environ.pop("KMP_AFFINITY", None)
+    configure_torch_threads(num_threads)
+
+    if device in ("auto", "cuda"):
+        import torch
+
+        if torch.cuda.device_count() > 1:
+            torch.cuda.set_device(index % torch.cuda.device_count())
+            logging.debug(f"Worker {index} uses GPU {torch.cuda.current_device()}")
+
+
+def preload_translator(args: argparse.Namespace) -> bool:
+    """Load the model for the command-line options, returning whether it loaded."""
+    translator = load_translator(
+        args.model,
+        args.provider,
+        args.source_lang,
+        args.target_lang,
+        args.model_size,
+        args.backend,
+        args.quantize,
+        args.dtype,
+        args.fast_attn,
+        args.device,
+        args.compile,
+        args.hf_token,
+    )
+    return translator is not None
+
+
+def start_workers(args: argparse.Namespace):
+    """Start the worker processes for --workers, or return None if the model fails to load.
+
+    The model is downloaded once here, not by every worker, and one worker loads it before
+    any output is written, so a failed load leaves no partial output file.
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    options = translation_options(args)
+    if not resolve_model_path(
+        options["model_name"],
+        options["provider"],
+        options["source_lang"],
+        options["target_lang"],
+        options["model_size"],
+        options["hf_token"],
+    ):
+        return None
+
+    num_threads = max(1, thread_count() // args.workers)
+    logging.info(f"Translating with {args.workers} worker processes, {num_threads} thread(s) each.")
+    # Spawned, not forked: forking a process that already runs OpenMP threads can deadlock
+    context = multiprocessing.get_context("spawn")
+    executor = ProcessPoolExecutor(
+        max_workers=args.workers,
+        mp_context=context,
+        initializer=init_worker,
+        initargs=(
+            num_threads, logging.getLogger().level, args.log_format, args.device, args.workers, context.Value("i", 0)
+        ),
+    )
+    if not executor.submit(preload_translator, args).result():
+        executor.shutdown()
+        return None
+    return executor
+
+
+def translate_in_workers(
+    blocks: Iterable[str], args: argparse.Namespace, executor
+) -> Generator[Optional[str], None, None]:
+    """Translate blocks in parallel worker processes, yielding the results in input order.
+
+    Each worker loads its own model and uses an equal share of the threads, which scales
+    better than one process once a small model stops benefiting from more threads.
+    Only a few blocks per worker are in flight, so memory use stays bounded.
+    """
+    from collections import deque
+
+    pending = deque()
+    for block in blocks:
+        pending.append(executor.submit(translate_lines, block, args))
+        if len(pending) >= 2 * args.workers:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def prefetch(args: argparse.Namespace) -> bool:
+    """Download the model and build every cached artifact for the selected options.
+
+    Meant for install time or an image build step, so the first real translation skips
+    downloading, conversion and quantization.
+    """
+    options = translation_options(args)
+    model_path = resolve_model_path(
+        options["model_name"],
+        options["provider"],
+        options["source_lang"],
+        options["target_lang"],
+        options["model_size"],
+        options["hf_token"],
+    )
+    if not model_path:
+        return False
+
+    # One warm-up translation converts, quantizes or compiles the model as the options require,
+    # so it must not be answered from the translation cache
+    options["translation_cache"] = "none"
+    if translate_texts([PREFETCH_TEXT], **options) is None:
+        return False
+
+    mark_model_ready(model_path)
+    logging.info(f"Model ready: {model_path}")
+    return True
+
+
+def read_input(args: argparse.Namespace) -> Iterable[str]:
+    """Return the text to translate as pieces: --text, the input file in chunks, or stdin."""
+    if args.text is not None:
+        return [args.text]
+    if args.input:
+        return read_in_chunks(args.input, chunk_size=STREAM_CHUNK_SIZE)
+    return sys.stdin
+
+
+def write_output(args: argparse.Namespace, blocks: Iterable[Optional[str]]) -> bool:
+    """Write translated blocks to the output file or stdout as they arrive.
+
+    A failed block is logged and skipped so the rest of the input is still translated;
+    returns False if any block failed.
+    """
+    if args.output:
+        try:
+            outfile = open(args.output, "w", encoding="utf-8", buffering=OUTPUT_BUFFER_SIZE)
+        except OSError as e:
+            logging.error(f"Failed to open output file '{args.output}': {e}")
+            sys.exit(1)
+    else:
+        outfile = sys.stdout
+    try:
+        succeeded = True
+        last_block = ""
+        for block in blocks:
+            if block is None:
+                logging.error("Translation failed for a block of the input, skipping it.")
+                succeeded = False
+                continue
+            outfile.write(block)
+            if outfile is sys.stdout:
+                # Show progress on the terminal or pipe, files are written in large buffered writes
+                outfile.flush()
+            last_block = block or last_block
+        # Keep the shell prompt off the translated --text line
+        if outfile is sys.stdout and args.text is not None and not last_block.endswith("\n"):
+            outfile.write("\n")
+    finally:
+        if outfile is not sys.stdout:
+            outfile.close()
+    return succeeded
+
+
+def serve_stdin(args: argparse.Namespace) -> None:
+    """Translate newline-delimited input from stdin, writing one translated line per input line."""
+    logging.info("Serving translations from stdin. Send EOF (Ctrl-D) to stop.")
+    for line in sys.stdin:
+        line = line.rstrip("\n")
+        translated_text = translate_lines(line, args)
+        if translated_text is None:
+            logging.error(f"Translation failed for line: '{line}'")
+            translated_text = ""
+        sys.stdout.write(translated_text + "\n")
+        sys.stdout.flush()
+
+
 def main():
     # Load configuration first
     config = load_config()
@@ -228,6 +1861,26 @@ def main():
     group.add_argument(
         "-i", "--input", type=str, help="Path to input file containing text to translate."
     )
+    group.add_argument(
+        "--serve",
+        action="store_true",
+        help="Keep the model loaded and translate newline-delimited stdin, one line at a time."
+    )
+    group.add_argument(
+        "--prefetch",
+        action="store_true",
+        help="Download the model and build its cached artifacts for the selected options, then exit."
+    )
+    group.add_argument(
+        "--run-daemon",
+        action="store_true",
+        help="Run the translation daemon in the foreground, listening on a unix socket."
+    )
+    group.add_argument(
+        "--stop-daemon",
+        action="store_true",
+        help="Stop a running translation daemon."
+    )
     parser.add_argument(
         "-o", "--output", type=str, help="Path to output file for translation."
     )
@@ -256,6 +1909,78 @@ def main():
         default=config.get("default_provider", "helsinki"),
         help=f"Model provider to use. Available: {', '.join(MODEL_PROVIDERS.keys())}"
     )
+    parser.add_argument(
+        "-b", "--backend", "--engine",
+        dest="backend",
+        type=lambda value: BACKEND_ALIASES.get(value, value),
+        choices=BACKENDS,
+        default=config.get("default_backend", "transformers"),
+        help="Inference backend: 'transformers' (hf), 'ctranslate2' (ct2) or 'onnxruntime' (ort). The latter two run "
+             "an int8-quantized model converted once and cached (default: from config or transformers)"
+    )
+    parser.add_argument(
+        "-q", "--quantize",
+        type=str,
+        choices=QUANTIZATION_MODES,
+        default=config.get("quantize", "none"),
+        help="Dynamically quantize the model's linear layers (transformers backend only). "
+             "The quantized model is cached after the first run (default: from config or none)"
+    )
+    parser.add_argument(
+        "--device",
+        type=parse_device,
+        default=str(config.get("device", "auto")),
+        help="Device to run the model on: auto, cpu, cuda, mps, cuda:N or a GPU index (-1 for the CPU). "
+             "'auto' picks CUDA, then Apple MPS, then the CPU (default: from config or auto)"
+    )
+    parser.add_argument(
+        "--dtype",
+        type=str,
+        choices=DTYPE_CHOICES,
+        default=config.get("dtype", "fp32"),
+        help="Weight precision for the transformers backend. 'bf16' loads bfloat16 weights and runs "
+             "under CPU autocast, fastest on CPUs with native BF16 support. 'auto' picks fp16 on GPUs, "
+             "bf16 on CPUs with native BF16 and fp32 otherwise (default: from config or fp32)"
+    )
+    parser.add_argument(
+        "--compile",
+        type=str,
+        choices=COMPILE_MODES,
+        default=config.get("compile", "none"),
+        help="Compile the model for fused kernels. 'torch' uses torch.compile (transformers backend); "
+             "the first run is slow while kernels are compiled and cached. 'ort' runs an exported, "
+             "graph-optimized ONNX model, like --backend onnxruntime (default: from config or none)"
+    )
+    parser.add_argument(
+        "--threads",
+        "--num-threads",
+        dest="threads",
+        type=int,
+        default=config.get("threads"),
+        help="Number of CPU threads for inference (default: from config, OMP_NUM_THREADS or one per physical core)"
+    )
+    parser.add_argument(
+        "--interop-threads",
+        type=int,
+        default=config.get("interop_threads"),
+        help="Number of inter-op threads: PyTorch's inter-op pool, or the number of CTranslate2 batches "
+             "translated in parallel (default: from config, 1 for PyTorch, threads/4 for CTranslate2)"
+    )
+    parser.add_argument(
+        "--fast-attn",
+        action=argparse.BooleanOptionalAction,
+        default=config.get("fast_attn", True),
+        help="Use fused scaled-dot-product attention (transformers backend). "
+             "Disable with --no-fast-attn to fall back to the reference implementation for debugging"
+    )
+    parser.add_argument(
+        "--preset",
+        type=str,
+        choices=list(PRESETS),
+        default=config.get("preset"),
+        help="Speed/quality preset for options not set explicitly. 'fast': greedy decoding, int8 weights, "
+             "smallest model size; 'quality': 4-beam search, full precision, largest model size"
+    )
     parser.add_argument(
         "--model-size",
         type=str,
@@ -267,6 +1992,68 @@ def main():
         default=config.get("max_length", 512),
         help="Maximum sequence length for translation (default: from config or 512)"
     )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=config.get("batch_size", DEFAULT_BATCH_SIZE),
+        help=f"Number of sentences translated per forward pass (default: from config or {DEFAULT_BATCH_SIZE})"
+    )
+    parser.add_argument(
+        "--bucket-window",
+        type=int,
+        default=config.get("bucket_window"),
+        help="Number of input lines whose sentences are sorted by length and batched together. Larger "
+             "windows waste less compute on padding but delay the first output (default: from config, "
+             "or sized automatically from the batch size)"
+    )
+    parser.add_argument(
+        "--beams", "--num-beams",
+        dest="beams",
+        type=int,
+        default=config.get("num_beams", 1),
+        help="Number of beams for beam search. 1 uses greedy decoding, the fastest option; "
+             "larger values can improve quality at a roughly proportional cost (default: from config or 1)"
+    )
+    parser.add_argument(
+        "--do-sample",
+        action="store_true",
+        default=config.get("do_sample", False),
+        help="Sample output tokens instead of picking the most likely one. Same speed as greedy decoding, "
+             "but translations vary between runs and are usually less accurate"
+    )
+    parser.add_argument(
+        "--max-new-tokens",
+        type=int,
+        default=config.get("max_new_tokens", None),
+        help="Maximum number of tokens to generate per text, overriding --max-length for decoding"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=config.get("workers", 1),
+        help="Number of worker processes translating file or stdin input in parallel, each with its own "
+             "model and a share of the CPU threads (default: from config or 1)"
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        default=config.get("use_daemon", False),
+        help="Translate through a background daemon that keeps the model loaded, starting it on first use."
+    )
+    parser.add_argument(
+        "--translation-cache",
+        type=str,
+        choices=TRANSLATION_CACHE_MODES,
+        default=config.get("translation_cache", "memory"),
+        help="Reuse finished translations of repeated sentences: 'memory' within one run, 'disk' also "
+             f"across runs in {TRANSLATION_CACHE_PATH} (default: from config or memory)"
+    )
+    parser.add_argument(
+        "--hf-token",
+        type=str,
+        default=None,
+        help="Hugging Face access token for downloading models (default: HF_TOKEN or the saved login)"
+    )
     parser.add_argument(
         "--log-level",
         type=str.upper,
@@ -281,6 +2068,24 @@ def main():
         help="Specify the log message format (Python logging format)"
     )
     args = parser.parse_args()
+    if args.preset:
+        apply_preset(args, parser)
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+    if args.bucket_window is not None and args.bucket_window < 1:
+        parser.error("--bucket-window must be at least 1")
+    if args.threads is not None and args.threads < 1:
+        parser.error("--threads must be at least 1")
+    if args.interop_threads is not None and args.interop_threads < 1:
+        parser.error("--interop-threads must be at least 1")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.workers > 1 and args.daemon:
+        parser.error("--workers cannot be combined with --daemon")
+    if args.compile == "ort":
+        if args.backend == "ctranslate2":
+            parser.error("--compile ort cannot be combined with --backend ctranslate2")
+        args.backend = "onnxruntime"
 
     # Configure logging based on command-line arguments or config
     log_level = getattr(logging, args.log_level.upper(), logging.INFO)
@@ -297,65 +2102,91 @@ def main():
     logging.debug(f"Target language: {args.target_lang}")
     logging.debug(f"Provider: {args.provider}")
     logging.debug(f"Model: {args.model if args.model else 'auto'}")
+    logging.debug(f"Preset: {args.preset if args.preset else 'none'}")
     logging.debug(f"Model size: {args.model_size if args.model_size else 'default'}")
+    logging.debug(f"Backend: {args.backend}")
+    logging.debug(f"Quantization: {args.quantize}")
+    logging.debug(f"Device: {args.device}")
+    logging.debug(f"Dtype: {args.dtype}")
+    logging.debug(f"Fast attention: {args.fast_attn}")
+    logging.debug(f"Compile: {args.compile}")
+    logging.debug(f"Threads: {args.threads if args.threads else 'auto'}")
     logging.debug(f"Max length: {args.max_length}")
+    logging.debug(f"Batch size: {args.batch_size}")
+    logging.debug(f"Beams: {args.beams}")
+    logging.debug(f"Sampling: {args.do_sample}")
+    logging.debug(f"Max new tokens: {args.max_new_tokens if args.max_new_tokens else 'default'}")
     logging.debug(f"Using config from: {DEFAULT_CONFIG_PATH if os.path.exists(DEFAULT_CONFIG_PATH) else 'default values'}")
 
-    # Input handling
+    # Must happen before the first torch import
+    configure_thread_env(args.threads, args.interop_threads)
+    if not args.stop_daemon:
+        check_dependencies()
+
+    # Daemon and server modes
+    if args.run_daemon:
+        run_daemon()
+        return
+    if args.stop_daemon:
+        if stop_daemon():
+            logging.info("Translation daemon stopped.")
+        else:
+            logging.info("No translation daemon running.")
+        return
+
+    # Heavy imports happen from here on, only when a translation actually runs in this process
+    if not args.daemon and args.workers == 1 and args.backend != "ctranslate2":
+        configure_torch_threads()
+    if args.prefetch:
+        if not prefetch(args):
+            logging.error("Prefetch failed.")
+            sys.exit(1)
+        return
+    if args.serve:
+        serve_stdin(args)
+        return
+
+    # Input handling: usage and input file errors are reported before any model is loaded
+    if not (args.text or args.input or not sys.stdin.isatty()):
+        print("No input text or file specified. Use --text, -i or pipe text via stdin.", file=sys.stderr)
+        sys.exit(1)
     if args.input:
         try:
-            with open(args.output, "w", encoding="utf-8") as outfile:
-                for chunk in read_in_chunks(args.input, chunk_size=1024):
-                    translated_text = translate_text(
-                        chunk,
-                        source_lang=args.source_lang,
-                        target_lang=args.target_lang,
-                        model_name=args.model,
-                        provider=args.provider,
-                        model_size=args.model_size,
-                        max_length=args.max_length
-                    )
-                    if translated_text:
-                        outfile.write(translated_text)
-                    else:
-                        logging.error(f"Translation failed for a chunk. Processing stopped.")
-                        sys.exit(1)
-            logging.info(f"Translation of '{args.input}' complete. Output written to '{args.output}'.")
+            with open(args.input, "rb"):
+                pass
+        except OSError as e:
+            logging.error(f"Failed to read input file '{args.input}': {e}")
+            sys.exit(1)
 
-        except FileNotFoundError:
-            logging.error(f"Input file '{args.input}' not found.")
+    # Load the model once, before any output is written, so a failed load leaves no partial output file
+    executor = None
+    if not args.daemon and args.workers == 1:
+        # Resolved once here, so the blocks skip the device and precision checks; workers
+        # resolve their own, as each may run on a different GPU
+        args.device, args.dtype, args.quantize = resolve_precision(args.device, args.dtype, args.quantize, args.backend)
+        if not preload_translator(args):
             sys.exit(1)
-        except Exception as e:
-            logging.error(f"An error occurred during file processing: {e}")
+    elif args.workers > 1:
+        executor = start_workers(args)
+        if executor is None:
             sys.exit(1)
 
-    elif args.text:
-        translated_text = translate_text(
-            args.text,
-            source_lang=args.source_lang,
-            target_lang=args.target_lang,
-            model_name=args.model,
-            provider=args.provider,
-            model_size=args.model_size,
-            max_length=args.max_length
-        )
-        if translated_text:
-            if args.output:
-                try:
-                    with open(args.output, "w", encoding="utf-8") as outfile:
-                        outfile.write(translated_text)
-                    logging.info(f"Translation written to '{args.output}'.")
-                except Exception as e:
-                    logging.error(f"Error writing to output file: {e}")
-            else:
-                print(translated_text)
-        else:
-            print("Translation failed.", file=sys.stderr)
+    source_name = f"'{args.input}'" if args.input else "stdin" if args.text is None else "text"
+    try:
+        if not write_output(args, translate_stream(read_input(args), args, executor=executor)):
+            logging.error("Translation failed for parts of the input.")
             sys.exit(1)
-
-    else:
-        print("No input text or file specified. Use --text or -i.", file=sys.stderr)
+        if args.output:
+            logging.info(f"Translation of {source_name} complete. Output written to '{args.output}'.")
+    except FileNotFoundError as e:
+        logging.error(f"File not found: '{e.filename}'.")
+        sys.exit(1)
+    except Exception as e:
+        logging.error(f"An error occurred during file processing: {e}")
         sys.exit(1)
+    finally:
+        if executor is not None:
+            executor.shutdown()
 
 if __name__ == "__main__":
     main()